@@ -2,14 +2,49 @@ from __future__ import annotations
 import json
 import time
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, Iterator, Union
+
+from llm_agent.agent import snapshot
 
 RUNS = Path("llm_agent/runs")
 RUNS.mkdir(parents=True, exist_ok=True)
+BLOBS = RUNS / "blobs"
 
 
-def write(record: Dict[str, Any]) -> str:
+def write(record: Dict[str, Any], compact: bool = True) -> str:
     ts = time.strftime("%Y%m%d-%H%M%S")
-    path = RUNS / f"run-{ts}.json"
-    path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+    if not compact:
+        path = RUNS / f"run-{ts}.json"
+        path.write_text(json.dumps(record, indent=2), encoding="utf-8")
+        return str(path)
+    path = RUNS / f"run-{ts}.snap"
+    path.write_bytes(snapshot.dumps(record, BLOBS, ts=ts))
     return str(path)
+
+
+def load(path: Union[str, Path], lazy: bool = True) -> Any:
+    """Load an audit record.
+
+    Legacy .json records are always plain dicts. For .snap records, lazy=True returns a
+    read-only snapshot.Snapshot (a Mapping whose logs are read on access); call
+    .to_dict() on it, or pass lazy=False, to get the same plain dict the JSON format gives.
+    """
+    path = Path(path)
+    if path.suffix == ".snap":
+        snap = snapshot.Snapshot(path, BLOBS)
+        return snap if lazy else snap.to_dict()
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def history() -> Iterator[Dict[str, Any]]:
+    """Yield snapshot headers (ts, namespace, context, pods, approved) without decoding bodies.
+
+    Snapshots written by an unsupported format version are skipped, since load() cannot open them.
+    """
+    for path in sorted(RUNS.glob("run-*.snap")):
+        try:
+            header = snapshot.read_header(path)
+        except ValueError:
+            continue
+        header["path"] = str(path)
+        yield header
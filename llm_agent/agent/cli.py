@@ -18,6 +18,7 @@ def run(
     namespace: str = typer.Option("demo", "--namespace", "-n"),
     approve: bool = typer.Option(False, "--approve"),
     max_pods: int = typer.Option(5, "--max-pods"),
+    json_audit: bool = typer.Option(False, "--json-audit", help="Write the legacy pretty-printed JSON record"),
 ):
     """LLM-planned incident agent: triage -> plan -> (optional) execute -> audit -> verify."""
     incident = collect(namespace=namespace, max_pods=max_pods)
@@ -28,7 +29,7 @@ def run(
     c.print(Panel(p.get("diagnosis", "(no diagnosis)"), title="LLM Diagnosis"))
 
     results = execute_plan(p, approve=approve)
-    audit_path = write({"incident": incident, "plan": p, "results": results, "approved": approve})
+    audit_path = write({"incident": incident, "plan": p, "results": results, "approved": approve}, compact=not json_audit)
 
     c.print(Panel(audit_path, title="Audit record"))
     c.print(Panel(verify(namespace), title="Verify pods"))
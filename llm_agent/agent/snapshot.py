@@ -0,0 +1,280 @@
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from collections.abc import Mapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# On-disk layout of a snapshot (run-<ts>.snap):
+#
+#   line 1   compact JSON header (ts, namespace, context, pod names, approved)
+#   rest     zlib-compressed compact JSON body
+#
+# The body interns every string into a single table. To keep that unambiguous in
+# JSON, string references are written as ints and real ints as their decimal
+# string; floats, bools and null pass through. Dict keys are always interned.
+# Anything json.dumps would reject raises TypeError here too.
+# Pods are stored column-wise and logs live in a content-addressed blob store
+# (blobs/<sha256[:2]>/<sha256>.z), so identical logs are stored once across runs.
+# Keys missing from some pods (or log kinds missing for some pods) are listed
+# under "missing" so the loader does not fill them in.
+
+VERSION = 1
+
+
+class _Interner:
+    def __init__(self) -> None:
+        self.strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+
+    def id(self, s: str) -> int:
+        i = self._ids.get(s)
+        if i is None:
+            i = self._ids[s] = len(self.strings)
+            self.strings.append(s)
+        return i
+
+    def pack(self, v: Any) -> Any:
+        if isinstance(v, str):
+            return self.id(v)
+        if isinstance(v, bool) or v is None or isinstance(v, float):
+            return v
+        if isinstance(v, int):
+            return str(v)
+        if isinstance(v, dict):
+            return {str(self.id(_key(k))): self.pack(x) for k, x in v.items()}
+        if isinstance(v, (list, tuple)):
+            return [self.pack(x) for x in v]
+        raise TypeError(f"Object of type {type(v).__name__} is not JSON serializable")
+
+
+def _key(k: Any) -> str:
+    # Same coercion json.dumps applies to dict keys.
+    if isinstance(k, str):
+        return k
+    if isinstance(k, (bool, int, float)) or k is None:
+        return json.dumps(k)
+    raise TypeError(f"keys must be str, int, float, bool or None, not {type(k).__name__}")
+
+
+def _unpack(v: Any, strings: List[str]) -> Any:
+    if isinstance(v, bool) or v is None or isinstance(v, float):
+        return v
+    if isinstance(v, int):
+        return strings[v]
+    if isinstance(v, str):
+        return int(v)
+    if isinstance(v, dict):
+        return {strings[int(k)]: _unpack(x, strings) for k, x in v.items()}
+    return [_unpack(x, strings) for x in v]
+
+
+def _blob_path(blobs: Path, digest: str) -> Path:
+    return blobs / digest[:2] / f"{digest}.z"
+
+
+def put_blob(blobs: Path, text: str) -> Optional[str]:
+    """Store text under its sha256 and return the digest (None for empty text)."""
+    if not text:
+        return None
+    raw = text.encode("utf-8")
+    digest = hashlib.sha256(raw).hexdigest()
+    path = _blob_path(blobs, digest)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # unique temp name: concurrent writers of the same blob must not share a file
+        with tempfile.NamedTemporaryFile(dir=path.parent, prefix=f"{digest}.", suffix=".tmp", delete=False) as f:
+            f.write(zlib.compress(raw, 6))
+        try:
+            os.replace(f.name, path)
+        except OSError:
+            os.unlink(f.name)
+            raise
+    return digest
+
+
+def get_blob(blobs: Path, digest: Optional[str]) -> str:
+    if not digest:
+        return ""
+    return zlib.decompress(_blob_path(blobs, digest).read_bytes()).decode("utf-8")
+
+
+def _columns(rows: List[Dict[str, Any]]) -> Tuple[Dict[str, List[Any]], Dict[str, List[int]]]:
+    cols: Dict[str, List[Any]] = {}
+    for row in rows:
+        for key in row:
+            cols.setdefault(key, [None] * len(rows))
+    missing: Dict[str, List[int]] = {}
+    for i, row in enumerate(rows):
+        for key in cols:
+            if key in row:
+                cols[key][i] = row[key]
+            else:
+                missing.setdefault(key, []).append(i)
+    return cols, missing
+
+
+def _columnar_pods(pods: Any) -> bool:
+    return isinstance(pods, list) and all(isinstance(p, dict) for p in pods)
+
+
+def _blob_logs(logs: Any) -> bool:
+    return isinstance(logs, dict) and all(
+        isinstance(name, str) and isinstance(per_pod, dict)
+        and all(isinstance(kind, str) and isinstance(text, str) for kind, text in per_pod.items())
+        for name, per_pod in logs.items()
+    )
+
+
+def _encode_incident(incident: Dict[str, Any], it: _Interner, blobs: Path) -> Dict[str, Any]:
+    # pods/logs of an unexpected shape stay in "rest" and go through the generic packer.
+    rest = dict(incident)
+    enc: Dict[str, Any] = {}
+
+    if _columnar_pods(rest.get("pods")):
+        pods = rest.pop("pods")
+        cols, missing = _columns(pods)
+        enc["pods"] = {"n": len(pods), "cols": it.pack(cols), "missing": it.pack(missing)}
+
+    if _blob_logs(rest.get("logs")):
+        logs = rest.pop("logs")
+        texts, missing = _columns(list(logs.values()))
+        enc["logs"] = {
+            "pod": it.pack(list(logs)),
+            # digests are written raw: interning unique hashes only grows the table
+            "blobs": {kind: [put_blob(blobs, t or "") for t in col] for kind, col in texts.items()},
+            "missing": missing,
+        }
+
+    enc["rest"] = it.pack(rest)
+    return enc
+
+
+def dumps(record: Dict[str, Any], blobs: Path, ts: str = "") -> bytes:
+    """Encode an audit record; incident logs are written to the blob store as a side effect."""
+    it = _Interner()
+    incident = record.get("incident")
+    if isinstance(incident, dict):
+        body: Dict[str, Any] = {
+            "record": it.pack({k: v for k, v in record.items() if k != "incident"}),
+            "incident": _encode_incident(incident, it, blobs),
+        }
+    else:
+        body = {"record": it.pack(record)}
+    body["strings"] = it.strings
+
+    incident = incident if isinstance(incident, dict) else {}
+    pods = incident.get("pods")
+    header = {
+        "v": VERSION,
+        "ts": ts,
+        "namespace": incident.get("namespace"),
+        "context": incident.get("context"),
+        "pods": [p.get("name") for p in pods] if _columnar_pods(pods) else [],
+        "approved": record.get("approved"),
+    }
+    payload = json.dumps(body, separators=(",", ":")).encode("utf-8")
+    return json.dumps(header, separators=(",", ":")).encode("utf-8") + b"\n" + zlib.compress(payload, 6)
+
+
+def read_header(path: Path) -> Dict[str, Any]:
+    """Parse only the first line of a snapshot; raise ValueError for unknown versions."""
+    with Path(path).open("rb") as f:
+        header: Dict[str, Any] = json.loads(f.readline())
+    if header.get("v") != VERSION:
+        raise ValueError(f"{path}: unsupported snapshot version {header.get('v')!r}")
+    return header
+
+
+class LazyLogs(Mapping):
+    """pod -> {kind: text}; blobs are read on first access."""
+
+    def __init__(
+        self,
+        pods: List[str],
+        digests: Dict[str, List[Optional[str]]],
+        missing: Dict[str, List[int]],
+        blobs: Path,
+    ):
+        self._index = {name: i for i, name in enumerate(pods)}
+        self._digests = digests
+        self._missing = {kind: set(idx) for kind, idx in missing.items()}
+        self._blobs = blobs
+        self._cache: Dict[str, Dict[str, str]] = {}
+
+    def __getitem__(self, pod: str) -> Dict[str, str]:
+        if pod not in self._cache:
+            i = self._index[pod]
+            self._cache[pod] = {
+                kind: get_blob(self._blobs, col[i])
+                for kind, col in self._digests.items()
+                if i not in self._missing.get(kind, ())
+            }
+        return self._cache[pod]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+
+class Snapshot(Mapping):
+    """Read-only view of an audit record. The header is parsed eagerly, the body on first access.
+
+    Not a dict: incident["logs"] is a LazyLogs, so json.dumps and other dict-only
+    code need to_dict() first.
+    """
+
+    def __init__(self, path: Path, blobs: Path):
+        self.path = Path(path)
+        self._blobs = blobs
+        self.header = read_header(self.path)
+        self._data: Optional[Dict[str, Any]] = None
+
+    def _load(self) -> Dict[str, Any]:
+        if self._data is not None:
+            return self._data
+        raw = self.path.read_bytes()
+        body = json.loads(zlib.decompress(raw[raw.index(b"\n") + 1:]))
+        strings = body["strings"]
+        data = _unpack(body["record"], strings)
+
+        enc = body.get("incident")
+        if enc is not None:
+            incident = _unpack(enc["rest"], strings)
+            if "pods" in enc:
+                cols = _unpack(enc["pods"]["cols"], strings)
+                missing = {k: set(v) for k, v in _unpack(enc["pods"]["missing"], strings).items()}
+                incident["pods"] = [
+                    {key: col[i] for key, col in cols.items() if i not in missing.get(key, ())}
+                    for i in range(enc["pods"]["n"])
+                ]
+            if "logs" in enc:
+                lg = enc["logs"]
+                incident["logs"] = LazyLogs(_unpack(lg["pod"], strings), lg["blobs"], lg["missing"], self._blobs)
+            data["incident"] = incident
+
+        self._data = data
+        return data
+
+    def __getitem__(self, key: str) -> Any:
+        return self._load()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._load())
+
+    def __len__(self) -> int:
+        return len(self._load())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully materialize the record, logs included, as plain dicts."""
+        data = dict(self._load())
+        if isinstance(data.get("incident"), dict) and isinstance(data["incident"].get("logs"), LazyLogs):
+            incident = dict(data["incident"])
+            incident["logs"] = {name: dict(v) for name, v in incident["logs"].items()}
+            data["incident"] = incident
+        return data
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from typing import Dict, List, Optional, Tuple
 
 import typer
 from rich.console import Console
+from rich.live import Live
+from rich.markup import escape
 from rich.panel import Panel
 from rich.table import Table
 
@@ -30,13 +33,62 @@ ISSUE_PATTERNS: List[Tuple[str, re.Pattern]] = [
     ("CreateContainerConfigError", re.compile(r"CreateContainerConfigError", re.I)),
 ]
 
+# Higher = worse. Picks the label when several patterns match, and breaks ties
+# between pods with equal restart counts.
+ISSUE_PRIORITY: Dict[str, int] = {
+    "OOMKilled": 7,
+    "CrashLoopBackOff": 6,
+    "Crashed (likely CrashLoop)": 5,
+    "CreateContainerConfigError": 4,
+    "ImagePullBackOff": 3,
+    "ProbeFail": 2,
+    "Pending/Unschedulable": 1,
+    "Unknown": 0,
+}
+
+
+@dataclass
+class PodMeta:
+    phase: str
+    restarts: int
+    last_seen: str  # RFC3339 timestamp; sorts lexicographically
+
 
 @dataclass
 class PodIssue:
     pod: str
     phase: str
-    restarts: str
+    restarts: Optional[int]  # None when `get pods -o json` had no entry for the pod
+    last_seen: str
     issue: str
+    error: str = ""
+
+
+def _pod_meta(item: Dict) -> PodMeta:
+    status = item.get("status", {}) or {}
+    cs = status.get("containerStatuses", []) or []
+    restarts = sum(int(s.get("restartCount", 0) or 0) for s in cs)
+
+    stamps = [status.get("startTime") or ""]
+    for s in cs:
+        for state in (s.get("state", {}) or {}, s.get("lastState", {}) or {}):
+            for detail in state.values():
+                if isinstance(detail, dict):
+                    stamps += [detail.get("finishedAt") or "", detail.get("startedAt") or ""]
+
+    return PodMeta(phase=status.get("phase", "?"), restarts=restarts, last_seen=max(stamps))
+
+
+def _severity(p: PodIssue) -> Tuple[int, int, str]:
+    # An unknown restart count adds nothing; such pods are ordered by issue and recency.
+    return (p.restarts or 0, ISSUE_PRIORITY.get(p.issue, 0), p.last_seen)
+
+
+def _pre_rank(meta: Optional[PodMeta]) -> Tuple[bool, int, str]:
+    # Pods without metadata sort first so --max-pods never drops them unseen.
+    if meta is None:
+        return (True, 0, "")
+    return (False, meta.restarts, meta.last_seen)
 
 
 def _find_bad_pods_from_table(pods_text: str) -> List[str]:
@@ -55,9 +107,9 @@ def _find_bad_pods_from_table(pods_text: str) -> List[str]:
 
 
 def _classify(blob: str) -> str:
-    for label, pat in ISSUE_PATTERNS:
-        if pat.search(blob):
-            return label
+    matches = [label for label, pat in ISSUE_PATTERNS if pat.search(blob)]
+    if matches:
+        return max(matches, key=lambda label: ISSUE_PRIORITY.get(label, 0))
     if re.search(r"\bError\b", blob, re.I):
         return "Crashed (likely CrashLoop)"
     return "Unknown"
@@ -76,10 +128,62 @@ def _suggest(issue: str) -> str:
     }.get(issue, "Inspect describe+events.")
 
 
+def _pod_events(events_text: str, pod: str) -> str:
+    return "\n".join(line for line in events_text.splitlines() if f"pod/{pod}" in line.split())
+
+
+def _triage_one(namespace: str, pod: str, events_text: str, meta: Optional[PodMeta]) -> PodIssue:
+    issue, error = "Unknown", ""
+    try:
+        desc = describe_pod(namespace, pod)
+        issue = _classify(desc.stdout + "\n" + _pod_events(events_text, pod))
+    except Exception as e:  # one slow/broken describe must not sink the whole table
+        error = f"describe failed: {type(e).__name__}: {e}"
+    if meta is None:
+        return PodIssue(pod=pod, phase="?", restarts=None, last_seen="", issue=issue, error=error)
+    return PodIssue(
+        pod=pod, phase=meta.phase, restarts=meta.restarts, last_seen=meta.last_seen, issue=issue, error=error
+    )
+
+
+def _render_table(ranked: List[PodIssue], total: int) -> Table:
+    table = Table(title=f"Triage Summary ({len(ranked)}/{total})")
+    table.add_column("Pod", style="bold")
+    table.add_column("Phase")
+    table.add_column("Restarts")
+    table.add_column("Likely Issue")
+    table.add_column("Suggested Next Actions")
+    for p in ranked:
+        restarts = "?" if p.restarts is None else str(p.restarts)
+        actions = f"[red]{escape(p.error)}[/red]" if p.error else _suggest(p.issue)
+        table.add_row(p.pod, p.phase, restarts, p.issue, actions)
+    return table
+
+
+def _fetch_logs(namespace: str, pod: str) -> Tuple[str, str]:
+    try:
+        return _fetch_logs_unsafe(namespace, pod)
+    except Exception as e:
+        return "", f"(log fetch failed: {type(e).__name__}: {e})"
+
+
+def _fetch_logs_unsafe(namespace: str, pod: str) -> Tuple[str, str]:
+    lg_prev = logs(namespace, pod, tail=120, previous=True)
+    prev_text = (lg_prev.stdout or "").strip()
+    if lg_prev.returncode != 0 or "unable to retrieve container logs" in prev_text:
+        prev_text = ""
+
+    lg_cur = logs(namespace, pod, tail=120, previous=False)
+    cur_text = lg_cur.stdout.strip() if lg_cur.returncode == 0 else ""
+    return prev_text, cur_text
+
+
 def main(
     namespace: str = typer.Option("demo", "--namespace", "-n"),
     pod: Optional[str] = typer.Option(None, "--pod", "-p"),
     max_pods: int = typer.Option(5, "--max-pods"),
+    log_pods: int = typer.Option(1, "--log-pods", help="Fetch logs for the K worst pods (0 to skip)"),
+    workers: int = typer.Option(8, "--workers", help="Concurrent kubectl calls"),
 ):
     """Read-only triage: pods/events/describe/logs -> diagnosis + suggested actions."""
     ctx = current_context()
@@ -102,44 +206,49 @@ def main(
     events_text = (events.stdout + "\n" + events.stderr).strip()
 
     pods_json = get_pods_json(namespace)
-    pod_meta: Dict[str, Tuple[str, str]] = {}
+    pod_meta: Dict[str, PodMeta] = {}
     if pods_json.returncode == 0:
         data = json.loads(pods_json.stdout)
         for item in data.get("items", []):
-            name = item["metadata"]["name"]
-            phase = item.get("status", {}).get("phase", "?")
-            cs = item.get("status", {}).get("containerStatuses", []) or []
-            restarts = str(cs[0].get("restartCount", 0)) if cs else "0"
-            pod_meta[name] = (phase, restarts)
+            pod_meta[item["metadata"]["name"]] = _pod_meta(item)
 
-    table = Table(title="Triage Summary")
-    table.add_column("Pod", style="bold")
-    table.add_column("Phase")
-    table.add_column("Restarts")
-    table.add_column("Likely Issue")
-    table.add_column("Suggested Next Actions")
+    # Pre-rank on what we already know so --max-pods keeps the worst pods, not the first ones.
+    selected = sorted(target_pods, key=lambda name: _pre_rank(pod_meta.get(name)), reverse=True)[:max_pods]
 
     ranked: List[PodIssue] = []
-    for p in target_pods[:max_pods]:
-        desc = describe_pod(namespace, p)
-        blob = (desc.stdout + "\n" + events_text)
-        issue = _classify(blob)
-        phase, restarts = pod_meta.get(p, ("?", "?"))
-        ranked.append(PodIssue(pod=p, phase=phase, restarts=restarts, issue=issue))
-        table.add_row(p, phase, restarts, issue, _suggest(issue))
-
-    c.print(table)
+    # Live redraws only make sense on a terminal; piped output gets one final table.
+    live = Live(_render_table(ranked, len(selected)), console=c, refresh_per_second=8) if c.is_terminal else None
+    if live:
+        live.start()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [
+                pool.submit(_triage_one, namespace, p, events_text, pod_meta.get(p)) for p in selected
+            ]
+            for fut in as_completed(futures):
+                ranked.append(fut.result())
+                ranked.sort(key=_severity, reverse=True)
+                if live:
+                    live.update(_render_table(ranked, len(selected)))
+    finally:
+        if live:
+            live.stop()
+    if not live:
+        c.print(_render_table(ranked, len(selected)))
 
     first = ranked[0].pod
+    top = [p.pod for p in ranked[: max(0, log_pods)]]
 
-    lg_prev = logs(namespace, first, tail=120, previous=True)
-    prev_text = (lg_prev.stdout or "").strip()
-    if lg_prev.returncode == 0 and prev_text and "unable to retrieve container logs" not in prev_text:
-        c.print(Panel(prev_text, title=f"Logs (previous): {first}"))
+    fetched: List[Tuple[str, str]] = []
+    if top:
+        with ThreadPoolExecutor(max_workers=max(1, min(workers, len(top)))) as pool:
+            fetched = list(pool.map(lambda name: _fetch_logs(namespace, name), top))
 
-    lg_cur = logs(namespace, first, tail=120, previous=False)
-    if lg_cur.returncode == 0 and lg_cur.stdout.strip():
-        c.print(Panel(lg_cur.stdout.strip(), title=f"Logs (current): {first}"))
+    for name, (prev_text, cur_text) in zip(top, fetched):
+        if prev_text:
+            c.print(Panel(prev_text, title=f"Logs (previous): {name}"))
+        if cur_text:
+            c.print(Panel(cur_text, title=f"Logs (current): {name}"))
 
     c.print(
         Panel(
@@ -0,0 +1,11 @@
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# llm_agent is imported from the repo root (as `python -m llm_agent.agent.cli` does),
+# local/agent as `agent`, the way `PYTHONPATH=local` does in the Makefile.
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(ROOT / "local"))
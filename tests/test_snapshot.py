@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import json
+import zlib
+
+import pytest
+
+from llm_agent.agent import snapshot
+
+
+def _record(n_pods: int = 3, log: str = "boom\n" * 50):
+    pods = [
+        {
+            "name": f"crashy-{i}",
+            "phase": "Running",
+            "conditions": [{"type": "Ready", "status": "False", "reason": "ContainersNotReady"}],
+            "containerStatuses": [
+                {
+                    "name": "app",
+                    "ready": False,
+                    "restartCount": i,
+                    "state": {"waiting": {"reason": "CrashLoopBackOff"}},
+                    "lastState": {"terminated": {"exitCode": 1, "reason": "Error"}},
+                }
+            ],
+        }
+        for i in range(n_pods)
+    ]
+    pods.append({"name": "odd", "phase": None})
+    logs = {p["name"]: {"current": log, "previous": ""} for p in pods}
+    logs["odd"] = {"current": "x"}
+    incident = {
+        "context": "kind-x",
+        "namespace": "demo",
+        "pods": pods,
+        "events_tail": "ev\n" * 5,
+        "logs": logs,
+    }
+    plan = {"summary": "s", "actions": [{"type": "delete_pod", "score": 0.5, "n": 3, "args": ["1", 2]}]}
+    return {"incident": incident, "plan": plan, "results": [], "approved": False}
+
+
+def _roundtrip(tmp_path, record, name="run.snap"):
+    path = tmp_path / name
+    path.write_bytes(snapshot.dumps(record, tmp_path / "blobs", ts="20260101-000000"))
+    return snapshot.Snapshot(path, tmp_path / "blobs")
+
+
+def _blob_files(tmp_path):
+    return sorted(p for p in (tmp_path / "blobs").rglob("*.z"))
+
+
+def test_roundtrip_reconstructs_record(tmp_path):
+    record = _record()
+    snap = _roundtrip(tmp_path, record)
+
+    assert snap.to_dict() == record
+    assert snap["incident"]["logs"]["odd"] == {"current": "x"}
+    assert snap.header["pods"] == ["crashy-0", "crashy-1", "crashy-2", "odd"]
+
+
+def test_blobs_deduplicated_across_records(tmp_path):
+    _roundtrip(tmp_path, _record(), "a.snap")
+    first = _blob_files(tmp_path)
+    snap = _roundtrip(tmp_path, _record(n_pods=5), "b.snap")
+
+    assert _blob_files(tmp_path) == first
+    assert len(first) == 2  # "boom..." and "x"; empty logs are not stored
+    assert snap.to_dict() == _record(n_pods=5)
+
+
+@pytest.mark.parametrize(
+    "record",
+    [
+        {"incident": None, "approved": True},
+        {"approved": False},
+        {"incident": {"pods": "not-a-list", "logs": {"a": {"current": None}}}},
+        {"incident": {"namespace": "demo"}},
+        {"incident": {"pods": [], "logs": {}}, "n": -7, "f": 1.0, "empty": ""},
+    ],
+)
+def test_roundtrip_edge_cases(tmp_path, record):
+    assert _roundtrip(tmp_path, record).to_dict() == record
+
+
+def test_int_keys_coerced_like_json(tmp_path):
+    record = {"plan": {1: "a", None: "b"}}
+    assert _roundtrip(tmp_path, record).to_dict() == json.loads(json.dumps(record))
+
+
+def test_unserializable_value_raises(tmp_path):
+    with pytest.raises(TypeError):
+        snapshot.dumps({"plan": {"x": object()}}, tmp_path / "blobs")
+
+
+def test_unknown_version_rejected(tmp_path):
+    path = tmp_path / "run.snap"
+    path.write_bytes(json.dumps({"v": 99}).encode() + b"\n" + zlib.compress(b"{}"))
+    with pytest.raises(ValueError):
+        snapshot.Snapshot(path, tmp_path / "blobs")
+
+
+def test_put_blob_leaves_no_temp_files(tmp_path):
+    digest = snapshot.put_blob(tmp_path, "hello")
+    assert snapshot.put_blob(tmp_path, "hello") == digest
+    assert [p.name for p in tmp_path.rglob("*") if p.is_file()] == [f"{digest}.z"]
+
+
+@pytest.fixture
+def audit(tmp_path, monkeypatch):
+    # audit creates its runs directory relative to the cwd at import time
+    monkeypatch.chdir(tmp_path)
+    from llm_agent.agent import audit
+
+    monkeypatch.setattr(audit, "RUNS", tmp_path)
+    monkeypatch.setattr(audit, "BLOBS", tmp_path / "blobs")
+    return audit
+
+
+def test_load_plain_dict(audit, tmp_path):
+    record = _record()
+    path = tmp_path / "run-1.snap"
+    path.write_bytes(snapshot.dumps(record, audit.BLOBS))
+
+    plain = audit.load(path, lazy=False)
+    assert type(plain["incident"]["logs"]) is dict
+    assert json.loads(json.dumps(plain)) == record
+    assert audit.load(path).to_dict() == plain
+
+
+def test_history_skips_unsupported_versions(audit, tmp_path):
+    (tmp_path / "run-1.snap").write_bytes(snapshot.dumps(_record(), audit.BLOBS, ts="1"))
+    (tmp_path / "run-2.snap").write_bytes(json.dumps({"v": 99}).encode() + b"\n")
+
+    assert [h["ts"] for h in audit.history()] == ["1"]
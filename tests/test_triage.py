@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import subprocess
+
+from agent import main
+from agent.main import PodIssue, PodMeta, _classify, _pod_events, _pod_meta, _pre_rank, _severity, _triage_one
+
+
+def _issue(restarts, issue="Unknown", last_seen=""):
+    return PodIssue(pod="p", phase="Running", restarts=restarts, last_seen=last_seen, issue=issue)
+
+
+def test_pod_meta_sums_restarts_across_containers():
+    item = {
+        "status": {
+            "phase": "Running",
+            "containerStatuses": [{"restartCount": 3}, {"restartCount": 4}, {}],
+        }
+    }
+    assert _pod_meta(item).restarts == 7
+
+
+def test_pod_meta_last_seen_is_latest_timestamp():
+    item = {
+        "status": {
+            "startTime": "2026-01-01T00:00:00Z",
+            "containerStatuses": [
+                {
+                    "state": {"running": {"startedAt": "2026-01-03T00:00:00Z"}},
+                    "lastState": {"terminated": {"startedAt": "2026-01-02T00:00:00Z", "finishedAt": "2026-01-02T01:00:00Z"}},
+                }
+            ],
+        }
+    }
+    assert _pod_meta(item).last_seen == "2026-01-03T00:00:00Z"
+    assert _pod_meta({"status": {"startTime": "2026-01-01T00:00:00Z"}}).last_seen == "2026-01-01T00:00:00Z"
+
+
+def test_classify_prefers_highest_priority_match():
+    assert _classify("State: Waiting Reason: CrashLoopBackOff\nLast State: Terminated Reason: OOMKilled") == "OOMKilled"
+    assert _classify("Status: Pending\nReason: ImagePullBackOff") == "ImagePullBackOff"
+    assert _classify("exit Error") == "Crashed (likely CrashLoop)"
+    assert _classify("all good") == "Unknown"
+
+
+def test_pod_events_matches_whole_object_token():
+    events = "\n".join(
+        [
+            "LAST SEEN TYPE REASON OBJECT MESSAGE",
+            "1m Warning BackOff pod/web-1 Back-off restarting",
+            "1m Warning OOMKilling pod/web-10 OOMKilled",
+        ]
+    )
+    assert _pod_events(events, "web-1") == "1m Warning BackOff pod/web-1 Back-off restarting"
+
+
+def test_severity_orders_restarts_then_priority_then_recency():
+    pods = [
+        _issue(1, "OOMKilled", "2026-01-09"),
+        _issue(5, "Unknown", "2026-01-01"),
+        _issue(1, "CrashLoopBackOff", "2026-01-01"),
+        _issue(1, "CrashLoopBackOff", "2026-01-05"),
+    ]
+    ranked = sorted(pods, key=_severity, reverse=True)
+    assert [(p.restarts, p.issue, p.last_seen) for p in ranked] == [
+        (5, "Unknown", "2026-01-01"),
+        (1, "OOMKilled", "2026-01-09"),
+        (1, "CrashLoopBackOff", "2026-01-05"),
+        (1, "CrashLoopBackOff", "2026-01-01"),
+    ]
+
+
+def test_pre_rank_keeps_pods_without_metadata():
+    metas = [PodMeta("Running", 9, "2026-01-01"), None, PodMeta("Running", 0, "")]
+    assert sorted(metas, key=_pre_rank, reverse=True)[0] is None
+
+
+def test_triage_one_survives_describe_failure(monkeypatch):
+    def boom(namespace, pod):
+        raise subprocess.TimeoutExpired(["kubectl", "describe"], 25)
+
+    monkeypatch.setattr(main, "describe_pod", boom)
+    row = _triage_one("demo", "p", "", None)
+    assert row.issue == "Unknown"
+    assert row.restarts is None
+    assert "TimeoutExpired" in row.error